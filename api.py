@@ -0,0 +1,29 @@
+"""
+In-process evaluation API for sweep drivers.
+
+Calling evaluate() repeatedly from one Python process avoids re-launching the
+interpreter and argparse per prediction file, and keeps the imports, the
+cached COCO index and the tokenized ground truth warm between runs. Scorer
+worker processes (and the METEOR/SPICE JVMs) are still started per call.
+
+    from api import evaluate
+    for pred in pred_files:
+        results = evaluate('evaluation/DLC-bench/annotations.json', pred)
+"""
+
+from evaluate_baseline_metrics import evaluate_captions
+
+
+def evaluate(gt, pred, output=None):
+    """
+    Evaluate one predictions file with standard captioning metrics.
+
+    Args:
+        gt: Path to DLC-Bench annotations.json
+        pred: Path to predictions JSON or NDJSON file
+        output: Optional path to save results JSON
+
+    Returns:
+        Dict mapping metric name to score
+    """
+    return evaluate_captions(gt, pred, output)
@@ -0,0 +1,153 @@
+"""
+Parallel caption evaluation against cached DLC-Bench ground truth.
+
+CachedGTEvalCap scores with pre-tokenized references from gt_cache, runs each
+scorer in its own worker process, and reuses CIDEr document frequencies
+pickled under the same cache directory.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pycocoevalcap.eval import COCOEvalCap
+from pycocoevalcap.tokenizer.ptbtokenizer import PTBTokenizer
+from pycocoevalcap.bleu.bleu import Bleu
+from pycocoevalcap.meteor.meteor import Meteor
+from pycocoevalcap.rouge.rouge import Rouge
+from pycocoevalcap.cider.cider import Cider
+from pycocoevalcap.cider.cider_scorer import CiderScorer
+from pycocoevalcap.spice.spice import Spice
+from gt_cache import CACHE_DIR, CACHE_TAG, gt_file_hash, load_cached_pickle, load_or_tokenize_gt, save_cached_pickle
+
+
+class CachedDFCiderScorer(CiderScorer):
+    """CiderScorer that reuses a precomputed document-frequency table."""
+
+    def __init__(self, document_frequency=None, **kwargs):
+        super().__init__(**kwargs)
+        if document_frequency:
+            self.document_frequency = document_frequency
+
+    def compute_doc_freq(self):
+        if not self.document_frequency:
+            super().compute_doc_freq()
+
+
+class CachedDFCider(Cider):
+    """CIDEr scorer that loads/saves its document frequencies from a pickle."""
+
+    def __init__(self, df_cache_file=None, **kwargs):
+        super().__init__(**kwargs)
+        self.df_cache_file = df_cache_file
+
+    def compute_score(self, gts, res):
+        assert(gts.keys() == res.keys())
+
+        document_frequency = None
+        if self.df_cache_file:
+            cached = load_cached_pickle(self.df_cache_file)
+            if cached is not None:
+                document_frequency = defaultdict(float, cached)
+
+        cider_scorer = CachedDFCiderScorer(document_frequency, n=self._n, sigma=self._sigma)
+        for id in gts.keys():
+            hypo = res[id]
+            ref = gts[id]
+            assert(type(hypo) is list)
+            assert(len(hypo) == 1)
+            assert(type(ref) is list)
+            assert(len(ref) > 0)
+            cider_scorer += (hypo[0], ref)
+
+        score, scores = cider_scorer.compute_score()
+
+        if self.df_cache_file and document_frequency is None:
+            save_cached_pickle(dict(cider_scorer.document_frequency), self.df_cache_file)
+        return score, scores
+
+
+# Scorer name -> (scorer class, constructor args, metric name(s))
+SCORERS = {
+    'Bleu': (Bleu, (4,), ["Bleu_1", "Bleu_2", "Bleu_3", "Bleu_4"]),
+    'METEOR': (Meteor, (), "METEOR"),
+    'ROUGE_L': (Rouge, (), "ROUGE_L"),
+    'CIDEr': (CachedDFCider, (), "CIDEr"),
+    'SPICE': (Spice, (), "SPICE"),
+}
+
+
+def tokenize_unique(captions_for_image):
+    """
+    PTB-tokenize captions, sending each distinct caption through the tokenizer once.
+
+    Args:
+        captions_for_image: Dict mapping image_id to a list of {'caption': ...} dicts
+
+    Returns:
+        Dict mapping image_id to a list of tokenized captions, as PTBTokenizer.tokenize
+    """
+    unique = {}
+    for anns in captions_for_image.values():
+        for ann in anns:
+            unique.setdefault(ann['caption'], len(unique))
+
+    tokenized = PTBTokenizer().tokenize({idx: [{'caption': caption}] for caption, idx in unique.items()})
+    return {
+        img_id: [tokenized[unique[ann['caption']]][0] for ann in anns]
+        for img_id, anns in captions_for_image.items()
+    }
+
+
+def _run_scorer(name, payload, extra_args=()):
+    """Build and run a single scorer on pickled (gts, res); executed in a worker process."""
+    gts, res = pickle.loads(payload)
+    scorer_cls, args, _ = SCORERS[name]
+    return scorer_cls(*args, *extra_args).compute_score(gts, res)
+
+
+class CachedGTEvalCap(COCOEvalCap):
+    """COCOEvalCap that scores against pre-tokenized ground truth in parallel."""
+
+    def __init__(self, coco, cocoRes, gt_file):
+        super().__init__(coco, cocoRes)
+        self.gt_hash = gt_file_hash(gt_file)
+        self.gts = load_or_tokenize_gt(gt_file, coco, self.gt_hash)
+        self.params['image_id'] = list(self.gts.keys())
+
+    def evaluate(self):
+        imgIds = self.params['image_id']
+        res = {imgId: self.cocoRes.imgToAnns[imgId] for imgId in imgIds}
+
+        # Only the predictions need tokenizing; ground truth is cached
+        print('tokenization...')
+        gts = {imgId: self.gts[imgId] for imgId in imgIds}
+        res = tokenize_unique(res)
+
+        # Scorers are independent, so run each in its own process (and JVM)
+        print('computing scores...')
+        # Document frequencies depend on which images' references are scored
+        ids_hash = hashlib.blake2b(repr(sorted(imgIds)).encode()).hexdigest()[:16]
+        cider_df_file = os.path.join(CACHE_DIR, f"cider_df_{CACHE_TAG}_{self.gt_hash}_{ids_hash}.pkl")
+        extra_args = {'CIDEr': (cider_df_file,)}
+        # Pickle gts/res once; each submit then only copies the bytes
+        payload = pickle.dumps((gts, res), protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(max_workers=len(SCORERS)) as ex:
+            futures = {
+                name: ex.submit(_run_scorer, name, payload, extra_args.get(name, ()))
+                for name in SCORERS
+            }
+            for name, future in futures.items():
+                score, scores = future.result()
+                method = SCORERS[name][2]
+                if type(method) == list:
+                    for sc, scs, m in zip(score, scores, method):
+                        self.setEval(sc, m)
+                        self.setImgToEvalImgs(scs, gts.keys(), m)
+                        print("%s: %0.3f" % (m, sc))
+                else:
+                    self.setEval(score, method)
+                    self.setImgToEvalImgs(scores, gts.keys(), method)
+                    print("%s: %0.3f" % (method, score))
+        self.setEvalImgs()
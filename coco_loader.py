@@ -0,0 +1,27 @@
+"""
+Load DLC-Bench ground truth once per process.
+
+COCO() parses and indexes the whole annotations file, so repeated
+evaluations in the same process share one instance per (path, mtime).
+"""
+
+import os
+from functools import lru_cache
+from pycocotools.coco import COCO
+
+
+@lru_cache(maxsize=4)
+def load_coco(gt_file_abspath, mtime):
+    """Build a COCO index for an annotations file; mtime only keys the cache."""
+    coco = COCO(gt_file_abspath)
+
+    # Add missing fields that COCO.loadRes/COCOEvalCap expect
+    coco.dataset.setdefault('info', {'description': 'DLC-Bench'})
+    coco.dataset.setdefault('licenses', [])
+    return coco
+
+
+def get_coco(gt_file):
+    """Return the shared COCO index for gt_file, reloading it if the file changed."""
+    gt_file = os.path.abspath(gt_file)
+    return load_coco(gt_file, os.path.getmtime(gt_file))
@@ -4,28 +4,84 @@ Evaluate baseline DAM-3B outputs using standard captioning metrics.
 Computes BLEU, CIDEr, METEOR, ROUGE-L, and SPICE scores.
 """
 
-import json
+import os
 import sys
-from pycocotools.coco import COCO
-from pycocoevalcap.eval import COCOEvalCap
+import orjson
+from coco_loader import get_coco
+from cached_eval import CachedGTEvalCap
 
+BANNER = "=" * 80
 
-def load_predictions(pred_file):
-    """Load predictions from JSON file."""
-    print(f"Loading predictions from {pred_file}...")
-    with open(pred_file, 'r') as f:
-        predictions = json.load(f)
+# JSON prediction files larger than this are stream-parsed instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 512 << 20
+
+
+def load_predictions_ndjson(pred_file):
+    """
+    Load predictions from a newline-delimited JSON file into COCO format.
+
+    Each line holds one prediction: {"key": "imgid_annid", "caption": "..."}
+    """
+    import polars as pl
+
+    return (
+        pl.scan_ndjson(pred_file, batch_size=4096, low_memory=False)
+        .filter(pl.col('key').str.contains('_', literal=True))
+        .with_columns(pl.col('key').str.split('_').list.get(0).cast(pl.Int64).alias('image_id'))
+        .select(['image_id', 'caption'])
+        .collect()
+        .to_dicts()
+    )
+
+
+def iter_predictions_streaming(pred_file):
+    """
+    Yield (key, caption) pairs from a JSON predictions file without loading it whole.
+
+    Duplicate keys keep their last value, as with orjson.loads; a first pass
+    counts key occurrences so only keys (not captions) are held in memory.
+    """
+    import ijson
+    from collections import Counter
+
+    with open(pred_file, 'rb') as f:
+        remaining = Counter(key for key, _ in ijson.kvitems(f, ''))
+
+    with open(pred_file, 'rb') as f:
+        for key, caption in ijson.kvitems(f, ''):
+            remaining[key] -= 1
+            if not remaining[key]:
+                yield key, caption
+
+
+def iter_predictions(pred_file):
+    """Yield COCO-format predictions from NDJSON (.ndjson) or legacy JSON file."""
+    if pred_file.endswith('.ndjson'):
+        yield from load_predictions_ndjson(pred_file)
+        return
+
+    if os.path.getsize(pred_file) > STREAMING_THRESHOLD_BYTES:
+        items = iter_predictions_streaming(pred_file)
+    else:
+        with open(pred_file, 'rb') as f:
+            items = orjson.loads(f.read()).items()
 
-    # Convert to COCO format: list of dicts with 'image_id' and 'caption'
-    results = []
-    for key, caption in predictions.items():
+    # Convert to COCO format: dicts with 'image_id' and 'caption'
+    for key, caption in items:
         # Key format: "imgid_annid"
-        if '_' in key:
-            img_id, ann_id = key.split('_')[0:2]
-            results.append({
+        img_id, sep, _ = key.partition('_')
+        if sep:
+            yield {
                 'image_id': int(img_id),
                 'caption': caption
-            })
+            }
+
+
+def load_predictions(pred_file):
+    """Load predictions from NDJSON (.ndjson) or legacy JSON file."""
+    print(f"Loading predictions from {pred_file}...")
+    # COCO.loadRes asserts its input is a list, so materialize once here
+    results = list(iter_predictions(pred_file))
 
     print(f"Loaded {len(results)} predictions")
     return results
@@ -37,58 +93,48 @@ def evaluate_captions(gt_file, pred_file, output_file=None):
 
     Args:
         gt_file: Path to DLC-Bench annotations.json
-        pred_file: Path to predictions JSON file
+        pred_file: Path to predictions JSON or NDJSON file
         output_file: Optional path to save results JSON
     """
     # Load ground truth annotations
     print(f"\nLoading ground truth from {gt_file}...")
-    coco = COCO(gt_file)
+    coco = get_coco(gt_file)
 
     # Load predictions
     predictions = load_predictions(pred_file)
 
-    # Create temporary file for COCO format predictions
-    import tempfile
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(predictions, f)
-        temp_pred_file = f.name
-
-    # Load predictions into COCO format
+    # Load predictions into COCO format (loadRes accepts the list directly)
     print("\nPreparing evaluation...")
-    coco_result = coco.loadRes(temp_pred_file)
+    coco_result = coco.loadRes(predictions)
 
-    # Create COCOEval object
-    coco_eval = COCOEvalCap(coco, coco_result)
+    # Create COCOEval object, reusing tokenized ground truth across runs
+    coco_eval = CachedGTEvalCap(coco, coco_result, gt_file)
 
     # Evaluate
     print("\nComputing metrics...")
     coco_eval.evaluate()
 
     # Print results
-    print("\n" + "="*80)
+    print("\n" + BANNER)
     print("BASELINE EVALUATION RESULTS (Standard Captioning Metrics)")
-    print("="*80)
+    print(BANNER)
 
     results = {}
     for metric, score in coco_eval.eval.items():
         print(f"{metric:12s}: {score:.4f}")
         results[metric] = float(score)
 
-    print("="*80)
+    print(BANNER)
 
     # Detailed scores per image (optional)
     print("\nPer-image scores computed. Use coco_eval.evalImgs for details.")
 
     # Save results if output file specified
     if output_file:
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(output_file, 'wb', buffering=65536) as f:
+            f.write(orjson.dumps(results))
         print(f"\nResults saved to: {output_file}")
 
-    # Cleanup temp file
-    import os
-    os.unlink(temp_pred_file)
-
     return results
 
 
@@ -109,7 +155,7 @@ def main():
         '--pred',
         type=str,
         required=True,
-        help='Path to predictions JSON file'
+        help='Path to predictions JSON or NDJSON file'
     )
     parser.add_argument(
         '--output',
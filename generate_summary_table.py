@@ -3,15 +3,19 @@
 Generate a summary table of reconstructed baseline outputs.
 """
 
+import csv
+import io
 import json
-import pandas as pd
-from pycocotools.coco import COCO
+import sys
+from coco_loader import get_coco
+
+BANNER = "=" * 80
 
 
 def main():
-    print("="*80)
+    print(BANNER)
     print("BASELINE OUTPUTS SUMMARY")
-    print("="*80)
+    print(BANNER)
 
     # Load predictions
     print("\nLoading reconstructed baseline outputs...")
@@ -22,78 +26,86 @@ def main():
 
     # Load annotations
     print("\nLoading DLC-Bench annotations...")
-    coco = COCO('annotations.json')
+    coco = get_coco('annotations.json')
     print(f"✓ Loaded {len(coco.getImgIds())} images with {len(coco.getAnnIds())} annotations")
 
-    # Analyze predictions
-    caption_lengths = [len(cap.split()) for cap in predictions.values()]
-    avg_length = sum(caption_lengths) / len(caption_lengths)
-    min_length = min(caption_lengths)
-    max_length = max(caption_lengths)
+    # Analyze predictions in a single pass
+    unique_images = set()
+    total_length = 0
+    min_length = float('inf')
+    max_length = 0
+    for key, caption in predictions.items():
+        unique_images.add(key.partition('_')[0])
+        length = len(caption.split())
+        total_length += length
+        if length < min_length:
+            min_length = length
+        if length > max_length:
+            max_length = length
+    avg_length = total_length / len(predictions)
 
     # Create summary statistics
-    print("\n" + "="*80)
+    print("\n" + BANNER)
     print("CAPTION STATISTICS")
-    print("="*80)
+    print(BANNER)
     print(f"  Total predictions:        {len(predictions)}")
     print(f"  Average caption length:   {avg_length:.1f} words")
     print(f"  Min caption length:       {min_length} words")
     print(f"  Max caption length:       {max_length} words")
-    print("="*80)
+    print(BANNER)
 
-    # Sample predictions
-    print("\n" + "="*80)
-    print("SAMPLE PREDICTIONS")
-    print("="*80)
+    # Sample predictions, written to stdout in a single call
+    buf = io.StringIO()
+    buf.write("\n" + BANNER + "\n")
+    buf.write("SAMPLE PREDICTIONS\n")
+    buf.write(BANNER + "\n")
 
     sample_keys = list(predictions.keys())[:5]
     for key in sample_keys:
         img_id, ann_id = key.split('_')
         caption = predictions[key]
-        print(f"\nImage {img_id}, Annotation {ann_id}:")
-        print(f"  {caption[:150]}{'...' if len(caption) > 150 else ''}")
+        buf.write(f"\nImage {img_id}, Annotation {ann_id}:\n")
+        buf.write(f"  {caption[:150]}{'...' if len(caption) > 150 else ''}\n")
 
-    print("\n" + "="*80)
+    buf.write("\n" + BANNER + "\n")
+    sys.stdout.write(buf.getvalue())
 
     # Create summary table
-    summary_data = {
-        'Metric': [
-            'Total Predictions',
-            'Unique Images',
-            'Avg Caption Length (words)',
-            'Min Caption Length (words)',
-            'Max Caption Length (words)'
-        ],
-        'Value': [
-            len(predictions),
-            len(set(k.split('_')[0] for k in predictions.keys())),
-            f"{avg_length:.1f}",
-            min_length,
-            max_length
-        ]
-    }
-
-    df = pd.DataFrame(summary_data)
+    summary_rows = [
+        ('Total Predictions', len(predictions)),
+        ('Unique Images', len(unique_images)),
+        ('Avg Caption Length (words)', f"{avg_length:.1f}"),
+        ('Min Caption Length (words)', min_length),
+        ('Max Caption Length (words)', max_length)
+    ]
+
+    metric_width = max(len('Metric'), *(len(metric) for metric, _ in summary_rows))
+    value_width = max(len('Value'), *(len(str(value)) for _, value in summary_rows))
 
     print("\nSUMMARY TABLE")
-    print("="*80)
-    print(df.to_string(index=False))
-    print("="*80)
+    print(BANNER)
+    print(f"{'Metric':>{metric_width}} {'Value':>{value_width}}")
+    for metric, value in summary_rows:
+        print(f"{metric:>{metric_width}} {str(value):>{value_width}}")
+    print(BANNER)
 
     # Save summary
-    df.to_csv('baseline_summary.csv', index=False)
+    with open('baseline_summary.csv', 'w', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Metric', 'Value'])
+        writer.writerows(summary_rows)
     print(f"\n✓ Summary saved to: baseline_summary.csv")
 
     # Note about evaluation
-    print("\n" + "="*80)
+    print("\n" + BANNER)
     print("NOTE: DLC-Bench Evaluation")
-    print("="*80)
+    print(BANNER)
     print("DLC-Bench uses LLM judge evaluation (not BLEU/CIDEr/METEOR).")
     print("To run evaluation, use:")
     print("  python evaluation/eval_model_outputs.py --pred <predictions.json>")
     print("\nStandard metrics (BLEU, CIDEr, etc.) require reference captions,")
     print("which are not provided in DLC-Bench.")
-    print("="*80)
+    print(BANNER)
 
 
 if __name__ == '__main__':
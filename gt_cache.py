@@ -0,0 +1,89 @@
+"""
+Cache PTB-tokenized ground truth captions across evaluation runs.
+
+The tokenized references only depend on the annotations file and the
+tokenizer, so they are pickled under ~/.cache/dam_eval keyed by a hash of the
+file contents and the installed pycocoevalcap version.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from coco_loader import get_coco
+from pycocoevalcap.tokenizer.ptbtokenizer import PTBTokenizer
+
+CACHE_DIR = os.path.expanduser('~/.cache/dam_eval')
+
+# Bump CACHE_FORMAT when the pickled layout changes; the pycocoevalcap version
+# invalidates caches when its tokenizer or scorers change
+CACHE_FORMAT = 1
+try:
+    _PYCOCOEVALCAP_VERSION = version('pycocoevalcap')
+except PackageNotFoundError:
+    _PYCOCOEVALCAP_VERSION = 'unknown'
+CACHE_TAG = f"v{CACHE_FORMAT}_pycocoevalcap-{_PYCOCOEVALCAP_VERSION}"
+
+
+def load_cached_pickle(cache_file):
+    """Return the object pickled in cache_file, or None if missing or unreadable."""
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Truncated, stale or otherwise damaged pickles are treated as a miss
+        print(f"Ignoring unreadable cache file {cache_file}: {e!r}")
+        return None
+
+
+def save_cached_pickle(obj, cache_file):
+    """Atomically pickle obj to cache_file so concurrent readers never see a partial file."""
+    cache_dir = os.path.dirname(cache_file)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
+def gt_file_hash(gt_file):
+    """Return a short content hash identifying an annotations file."""
+    with open(gt_file, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()[:16]
+
+
+def load_or_tokenize_gt(gt_file, coco=None, gt_hash=None):
+    """
+    Load tokenized ground truth from cache, tokenizing and caching on a miss.
+
+    Args:
+        gt_file: Path to DLC-Bench annotations.json
+        coco: Optional already-loaded COCO object for gt_file
+        gt_hash: Optional precomputed gt_file_hash(gt_file)
+
+    Returns:
+        Dict mapping image_id to a list of tokenized reference captions
+    """
+    if gt_hash is None:
+        gt_hash = gt_file_hash(gt_file)
+    cache_file = os.path.join(CACHE_DIR, f"gt_{CACHE_TAG}_{gt_hash}.pkl")
+    gts = load_cached_pickle(cache_file)
+    if gts is not None:
+        print(f"Loaded tokenized ground truth from {cache_file}")
+        return gts
+
+    if coco is None:
+        coco = get_coco(gt_file)
+    gts = {img_id: coco.imgToAnns[img_id] for img_id in coco.getImgIds()}
+    gts = PTBTokenizer().tokenize(gts)
+
+    save_cached_pickle(gts, cache_file)
+    print(f"Cached tokenized ground truth to {cache_file}")
+    return gts